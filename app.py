@@ -3,8 +3,8 @@
 
 Hosts CI/CD pipeline and translation service built on AWS:
 - S3 (Input/Output buckets)
-- Lambda (presigned URL, Translate trigger, completion notification)
-- Amazon Translate (async batch for HTML/text; PDF via Textract preprocessing)
+- Lambda (presigned URL, Translate trigger, Textract completion, completion notification)
+- Amazon Translate (async batch for HTML/text; PDF via async Textract preprocessing)
 - API Gateway, SNS
 """
 
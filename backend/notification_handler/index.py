@@ -3,58 +3,105 @@
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
+from botocore.config import Config
 
-SNS = boto3.client("sns")
-DYNAMO = boto3.resource("dynamodb")
+BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# One shared session; resolve credentials during init rather than on the first call
+_SESSION = boto3.session.Session()
+_SESSION.get_credentials().get_frozen_credentials()
+SNS = _SESSION.client("sns", config=BOTO_CFG)
+DDB = _SESSION.client("dynamodb", config=BOTO_CFG)
+TABLE_NAME = os.environ.get("TABLE_NAME")
+JOB_ID_INDEX = "job_id-index"
+# Translate output path: .../account-TranslateText-jobId/...
+JOB_ID_RE = re.compile(r"TranslateText-([^/]+)")
+SNS_BATCH_SIZE = 10  # PublishBatch limit
+NOTIFY_SUBJECT = "Translation complete: PDF Poly Lingo"
+
+_POOL = ThreadPoolExecutor(max_workers=10)
 
 
 def handler(event, context):
     """Publish to SNS and update DynamoDB when new object appears in Output bucket."""
     topic_arn = os.environ["COMPLETION_TOPIC_ARN"]
-    table_name = os.environ.get("TABLE_NAME")
-
-    for record in event.get("Records", []):
-        bucket = record["s3"]["bucket"]["name"]
-        key = record["s3"]["object"]["key"]
-        size = record["s3"]["object"].get("size", 0)
-
-        # Skip auxiliary metadata and details subfolder - return only the translated document
-        if (
-            key.endswith(".auxiliary-translation-details.json")
-            or "/details/" in key
-        ):
-            continue
-
-        # Extract job_id from path: .../account-TranslateText-jobId/...
-        match = re.search(r"TranslateText-([^/]+)", key)
-        if match and table_name:
-            job_id = match.group(1)
-            table = DYNAMO.Table(table_name)
-            # Find item by job_id (scan or GSI)
-            resp = table.scan(FilterExpression="job_id = :jid", ExpressionAttributeValues={":jid": job_id})
-            for item in resp.get("Items", []):
-                table.update_item(
-                    Key={"request_id": item["request_id"]},
-                    UpdateExpression="SET #s = :s, output_key = :k, output_bucket = :b",
-                    ExpressionAttributeNames={"#s": "status"},
-                    ExpressionAttributeValues={
-                        ":s": "complete",
-                        ":k": key,
-                        ":b": bucket,
-                    },
-                )
-                break
-
-        SNS.publish(
-            TopicArn=topic_arn,
-            Subject="Translation complete: PDF Poly Lingo",
-            Message=json.dumps({
-                "event": "translation_complete",
-                "bucket": bucket,
-                "key": key,
-                "size": size,
-            }),
-        )
+
+    # Skip auxiliary metadata and details subfolder - return only the translated document
+    records = [
+        r for r in event.get("Records", [])
+        if not _is_auxiliary(r["s3"]["object"]["key"])
+    ]
+
+    # DynamoDB updates per record run concurrently; SNS entries keep record order
+    messages = list(_POOL.map(_process_record, records))
+    entries = [
+        {"Id": str(i), "Subject": NOTIFY_SUBJECT, "Message": message}
+        for i, message in enumerate(messages)
+    ]
+
+    _publish_all(topic_arn, entries)
     return {"statusCode": 200}
+
+
+def _process_record(record):
+    """Mark the job complete in DynamoDB; return the SNS message for this output object."""
+    bucket = record["s3"]["bucket"]["name"]
+    key = record["s3"]["object"]["key"]
+    size = record["s3"]["object"].get("size", 0)
+
+    # Extract job_id from path: .../account-TranslateText-jobId/...
+    match = JOB_ID_RE.search(key)
+    if match and TABLE_NAME:
+        job_id = match.group(1)
+        # Find item by job_id via GSI (KEYS_ONLY projection returns request_id)
+        resp = DDB.query(
+            TableName=TABLE_NAME,
+            IndexName=JOB_ID_INDEX,
+            KeyConditionExpression="job_id = :j",
+            ExpressionAttributeValues={":j": {"S": job_id}},
+            Limit=1,
+        )
+        for item in resp.get("Items", []):
+            DDB.update_item(
+                TableName=TABLE_NAME,
+                Key={"request_id": item["request_id"]},
+                UpdateExpression="SET #s = :s, output_key = :k, output_bucket = :b",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={
+                    ":s": {"S": "complete"},
+                    ":k": {"S": key},
+                    ":b": {"S": bucket},
+                },
+            )
+            break
+
+    return json.dumps({
+        "event": "translation_complete",
+        "bucket": bucket,
+        "key": key,
+        "size": size,
+    })
+
+
+def _is_auxiliary(key):
+    return key.endswith(".auxiliary-translation-details.json") or "/details/" in key
+
+
+def _publish_all(topic_arn, entries):
+    """PublishBatch in slices of 10; retry failed entries with single publish."""
+    for i in range(0, len(entries), SNS_BATCH_SIZE):
+        batch = entries[i:i + SNS_BATCH_SIZE]
+        resp = SNS.publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=batch)
+        by_id = {entry["Id"]: entry for entry in batch}
+        for failed in resp.get("Failed", []):
+            entry = by_id[failed["Id"]]
+            SNS.publish(TopicArn=topic_arn, Subject=entry["Subject"], Message=entry["Message"])
@@ -1,49 +1,121 @@
 """Generate presigned S3 URLs for direct upload."""
 
-import json
-import uuid
+import datetime
+import hashlib
+import hmac
 import os
-import boto3
+import secrets
+from urllib.parse import quote
+
+import botocore.session
+import orjson
+
+REGION = os.environ["REGION"]
+# Lambda credentials are fixed for the lifetime of the execution environment
+CREDENTIALS = botocore.session.Session().get_credentials().get_frozen_credentials()
+
+# SigV4 signing key per UTC date (YYYYMMDD); rotates at midnight
+_SIGNING_KEYS = {}
+
+_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
 
 
 def handler(event, context):
     """Generate presigned PUT URL for uploading PDF/HTML to Input bucket."""
-    body = json.loads(event.get("body") or "{}")
+    body = orjson.loads(event.get("body") or "{}")
     filename = body.get("filename", "document")
     target_language = body.get("target_language", "es")
     source_language = body.get("source_language") or "auto"
 
     ext = os.path.splitext(filename)[1].lower() or ".txt"
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(16)
     key = f"uploads/{request_id}/{filename}"
 
     bucket = os.environ["INPUT_BUCKET"]
-    region = os.environ["REGION"]
-    s3 = boto3.client("s3", region_name=region)
-
-    url = s3.generate_presigned_url(
-        "put_object",
-        Params={
-            "Bucket": bucket,
-            "Key": key,
-            "ContentType": _content_type(ext),
-            "Metadata": {
-                "target-language": target_language,
-                "source-language": source_language,
-            },
+
+    url = sign_put(
+        bucket,
+        key,
+        content_type=_content_type(ext),
+        metadata={
+            "target-language": target_language,
+            "source-language": source_language,
         },
-        ExpiresIn=3600,
+        expires=3600,
     )
 
-    return {
-        "statusCode": 200,
-        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-        "body": json.dumps({
-            "upload_url": url,
-            "key": key,
-            "request_id": request_id,
-        }),
+    return _response(200, {
+        "upload_url": url,
+        "key": key,
+        "request_id": request_id,
+    })
+
+
+def sign_put(bucket, key, content_type, metadata, expires):
+    """SigV4 presigned S3 PUT URL (same signed headers as boto3 put_object presign)."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    datestamp = amz_date[:8]
+    scope = f"{datestamp}/{REGION}/s3/aws4_request"
+    host = f"{bucket}.s3.{REGION}.amazonaws.com"
+    path = "/" + quote(key, safe="/~")
+
+    headers = {"content-type": content_type, "host": host}
+    for name, value in metadata.items():
+        headers[f"x-amz-meta-{name.lower()}"] = str(value).strip()
+    signed_headers = ";".join(sorted(headers))
+
+    params = {
+        "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+        "X-Amz-Credential": f"{CREDENTIALS.access_key}/{scope}",
+        "X-Amz-Date": amz_date,
+        "X-Amz-Expires": str(expires),
+        "X-Amz-SignedHeaders": signed_headers,
     }
+    if CREDENTIALS.token:
+        params["X-Amz-Security-Token"] = CREDENTIALS.token
+    query = "&".join(
+        f"{quote(k, safe='~')}={quote(v, safe='~')}" for k, v in sorted(params.items())
+    )
+
+    canonical_request = "\n".join([
+        "PUT",
+        path,
+        query,
+        "".join(f"{name}:{headers[name]}\n" for name in sorted(headers)),
+        signed_headers,
+        "UNSIGNED-PAYLOAD",
+    ])
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+    signature = hmac.new(
+        _signing_key(datestamp), string_to_sign.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    return f"https://{host}{path}?{query}&X-Amz-Signature={signature}"
+
+
+def _signing_key(datestamp):
+    """Derive (or reuse) kSigning = HMAC chain over date, region, service."""
+    key = _SIGNING_KEYS.get(datestamp)
+    if key is None:
+        key = _hmac(("AWS4" + CREDENTIALS.secret_key).encode("utf-8"), datestamp)
+        for part in (REGION, "s3", "aws4_request"):
+            key = _hmac(key, part)
+        _SIGNING_KEYS.clear()
+        _SIGNING_KEYS[datestamp] = key
+    return key
+
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _response(status, body):
+    return {"statusCode": status, "headers": _HEADERS, "body": orjson.dumps(body).decode()}
 
 
 def _content_type(ext):
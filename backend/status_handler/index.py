@@ -1,14 +1,51 @@
 """Status API: get translation job status and download URL."""
 
-import json
 import os
+import time
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-DYNAMO = boto3.resource("dynamodb")
-S3 = boto3.client("s3")
-TRANSLATE = boto3.client("translate")
+try:
+    from snapshot_restore_py import register_after_restore
+except ImportError:  # Only provided by the Lambda runtime
+    register_after_restore = None
+
+BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# One shared session; resolve credentials during init rather than on the first call
+_SESSION = boto3.session.Session()
+_SESSION.get_credentials().get_frozen_credentials()
+DDB = _SESSION.client("dynamodb", config=BOTO_CFG)
+TABLE_NAME = os.environ["TABLE_NAME"]
+S3 = _SESSION.client("s3", config=BOTO_CFG)
+
+DOWNLOAD_URL_TTL = 3600  # Presigned GET validity (seconds)
+DOWNLOAD_URL_CACHE_TTL = 3500  # Cached in DynamoDB slightly shorter than the URL itself
+DOWNLOAD_URL_MIN_REMAINING = 60  # Re-sign if cached URL expires within this window
+
+_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+
+
+def _prewarm():
+    """Open the DynamoDB connection at init and after SnapStart restore (presigning needs no network)."""
+    try:
+        DDB.describe_table(TableName=TABLE_NAME)
+    except Exception as e:
+        print(f"Prewarm describe_table failed: {e}")
+
+
+_prewarm()
+if register_after_restore:
+    register_after_restore(_prewarm)
 
 
 def handler(event, context):
@@ -17,30 +54,22 @@ def handler(event, context):
     if not request_id:
         return _response(400, {"error": "Missing request_id"})
 
-    table_name = os.environ["TABLE_NAME"]
-    output_bucket = os.environ["OUTPUT_BUCKET"]
-    table = DYNAMO.Table(table_name)
-
     try:
-        row = table.get_item(Key={"request_id": request_id}).get("Item")
+        item = DDB.get_item(
+            TableName=TABLE_NAME, Key={"request_id": {"S": request_id}}
+        ).get("Item")
     except Exception as e:
         return _response(500, {"error": str(e)})
 
-    if not row:
+    if not item:
         return _response(200, {"status": "pending", "request_id": request_id})
 
+    row = _decode(item)
+
+    # Completion (output_key/output_bucket) is recorded by notification_handler
     status = row.get("status", "pending")
     job_id = row.get("job_id")
 
-    # Fallback: if stuck in_progress, check Translate job and output bucket directly
-    if status in ("in_progress", "processing") and job_id:
-        output_key, output_bucket = _check_translate_complete(
-            job_id, output_bucket, table, request_id
-        )
-        if output_key and output_bucket:
-            status = "complete"
-            row = {"output_key": output_key, "output_bucket": output_bucket, **row}
-
     result = {
         "request_id": request_id,
         "status": status,
@@ -50,63 +79,52 @@ def handler(event, context):
         result["error"] = row["error"]
 
     if status == "complete" and row.get("output_key") and row.get("output_bucket"):
-        params = {
-            "Bucket": row["output_bucket"],
-            "Key": row["output_key"],
-            "ResponseContentDisposition": _build_content_disposition(row),
-        }
-        ext = os.path.splitext(row["output_key"].split("/")[-1])[1].lower()
-        if ext in (".txt",):
-            params["ResponseContentType"] = "text/plain; charset=utf-8"
-        elif ext in (".html", ".htm"):
-            params["ResponseContentType"] = "text/html; charset=utf-8"
-        url = S3.generate_presigned_url("get_object", Params=params, ExpiresIn=3600)
-        result["download_url"] = url
+        result["download_url"] = _download_url(row, request_id)
 
     return _response(200, result)
 
 
-def _check_translate_complete(job_id, output_bucket, table, request_id):
-    """If Translate job is done, find output file, update DynamoDB, return (key, bucket)."""
-    try:
-        resp = TRANSLATE.describe_text_translation_job(JobId=job_id)
-        job_status = resp.get("TextTranslationJobProperties", {}).get("JobStatus")
-        if job_status != "COMPLETED":
-            return None, None
-    except ClientError:
-        return None, None
-
-    # List output bucket, find the translated file (skip auxiliary metadata, prefer content files)
+def _download_url(row, request_id):
+    """Return cached presigned GET URL from the row, or sign a new one and cache it."""
+    now = time.time()
+    if row.get("download_url") and row.get("download_url_expires", 0) > now + DOWNLOAD_URL_MIN_REMAINING:
+        return row["download_url"]
+
+    params = {
+        "Bucket": row["output_bucket"],
+        "Key": row["output_key"],
+        "ResponseContentDisposition": _build_content_disposition(row),
+    }
+    ext = os.path.splitext(row["output_key"].split("/")[-1])[1].lower()
+    if ext in (".txt",):
+        params["ResponseContentType"] = "text/plain; charset=utf-8"
+    elif ext in (".html", ".htm"):
+        params["ResponseContentType"] = "text/html; charset=utf-8"
+    url = S3.generate_presigned_url("get_object", Params=params, ExpiresIn=DOWNLOAD_URL_TTL)
     try:
-        paginator = S3.get_paginator("list_objects_v2")
-        best_key = None
-        best_size = -1
-        for page in paginator.paginate(Bucket=output_bucket):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                size = obj.get("Size", 0)
-                if (
-                    job_id in key
-                    and not key.endswith(".auxiliary-translation-details.json")
-                    and "/details/" not in key
-                    and size > best_size
-                ):
-                    best_key, best_size = key, size
-        if best_key:
-            table.update_item(
-                Key={"request_id": request_id},
-                UpdateExpression="SET #s = :s, output_key = :k, output_bucket = :b",
-                ExpressionAttributeNames={"#s": "status"},
-                ExpressionAttributeValues={
-                    ":s": "complete",
-                    ":k": best_key,
-                    ":b": output_bucket,
-                },
-            )
-            return best_key, output_bucket
-    except ClientError:
-        pass
-    return None, None
+        DDB.update_item(
+            TableName=TABLE_NAME,
+            Key={"request_id": {"S": request_id}},
+            UpdateExpression="SET download_url = :u, download_url_expires = :e",
+            ExpressionAttributeValues={
+                ":u": {"S": url},
+                ":e": {"N": str(int(now) + DOWNLOAD_URL_CACHE_TTL)},
+            },
+        )
+    except ClientError as e:
+        print(f"Could not cache download URL for {request_id}: {e}")
+    return url
+
+
+def _decode(item):
+    """Flatten a low-level DynamoDB item (S -> str, N -> int); other types are not stored."""
+    row = {}
+    for name, value in item.items():
+        if "S" in value:
+            row[name] = value["S"]
+        elif "N" in value:
+            row[name] = int(value["N"])
+    return row
 
 
 def _build_content_disposition(row):
@@ -121,8 +139,4 @@ def _build_content_disposition(row):
 
 
 def _response(status, body):
-    return {
-        "statusCode": status,
-        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-        "body": json.dumps(body),
-    }
+    return {"statusCode": status, "headers": _HEADERS, "body": orjson.dumps(body).decode()}
@@ -0,0 +1,197 @@
+"""SNS trigger: Textract finished a PDF - write extracted text and start Amazon Translate job."""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+
+BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# One shared session; resolve credentials during init rather than on the first call
+_SESSION = boto3.session.Session()
+_SESSION.get_credentials().get_frozen_credentials()
+TRANSLATE_CLIENT = _SESSION.client("translate", config=BOTO_CFG)
+TEXTRACT_CLIENT = _SESSION.client("textract", config=BOTO_CFG)
+S3 = _SESSION.client("s3", config=BOTO_CFG)
+DDB = _SESSION.client("dynamodb", config=BOTO_CFG)
+TABLE_NAME = os.environ["TABLE_NAME"]
+
+MULTIPART_CHUNK_BYTES = 5 * 1024 * 1024  # S3 minimum part size (except last part)
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def handler(event, context):
+    """Process Textract completion notifications (JobTag carries request_id)."""
+    for record in event.get("Records", []):
+        message = json.loads(record["Sns"]["Message"])
+        request_id = message.get("JobTag")
+        textract_job_id = message.get("JobId")
+        if not request_id or not textract_job_id:
+            continue
+        try:
+            if message.get("Status") != "SUCCEEDED":
+                raise RuntimeError(f"Textract job {message.get('Status', 'failed').lower()}")
+            process_extraction(request_id, textract_job_id)
+        except Exception as e:
+            print(f"Error processing Textract job {textract_job_id}: {e}")
+            _record_failure(request_id, str(e))
+    return {"statusCode": 200}
+
+
+def process_extraction(request_id, textract_job_id):
+    """Stream Textract LINE blocks to temp bucket and start Translate job on them."""
+    output_bucket = os.environ["OUTPUT_BUCKET"]
+    temp_bucket = os.environ["TEMP_BUCKET"]
+    role_arn = os.environ["TRANSLATE_ROLE_ARN"]
+
+    row = DDB.get_item(
+        TableName=TABLE_NAME,
+        Key={"request_id": {"S": request_id}},
+        ProjectionExpression="target_language, source_language",
+    ).get("Item") or {}
+    # No languages means the row was replaced by a failure (or never written) - don't guess
+    target_lang = row.get("target_language", {}).get("S")
+    if not target_lang:
+        raise ValueError(f"No target language recorded for request {request_id}")
+    source_lang = row.get("source_language", {}).get("S") or "auto"
+    target_codes = [target_lang]
+
+    temp_prefix = f"temp/{textract_job_id}/"
+    txt_key = f"{temp_prefix}extracted.txt"
+    _stream_text_to_s3(textract_job_id, temp_bucket, txt_key)
+
+    # Start Translate job on the extracted text
+    job_id = _start_batch_job(
+        input_uri=f"s3://{temp_bucket}/{temp_prefix}",
+        output_uri=f"s3://{output_bucket}/",
+        role_arn=role_arn,
+        source_lang=source_lang,
+        target_codes=target_codes,
+        content_type="text/plain",
+        request_id=request_id,
+    )
+
+    DDB.update_item(
+        TableName=TABLE_NAME,
+        Key={"request_id": {"S": request_id}},
+        UpdateExpression="SET #s = :s, job_id = :j",
+        ExpressionAttributeNames={"#s": "status"},
+        ExpressionAttributeValues={":s": {"S": "in_progress"}, ":j": {"S": job_id}},
+    )
+
+    # Job-started event goes to CloudWatch Logs (no SNS round-trip)
+    print(json.dumps({
+        "event": "job_started",
+        "job_id": job_id,
+        "textract_job_id": textract_job_id,
+        "target_language": target_lang,
+    }))
+    return job_id
+
+
+def _stream_text_to_s3(textract_job_id, bucket, key):
+    """Write Textract LINE text to S3 page by page via multipart upload (memory bounded by one part)."""
+    mpu = S3.create_multipart_upload(Bucket=bucket, Key=key, ContentType="text/plain")
+    upload_id = mpu["UploadId"]
+    futures = []
+    buf = bytearray()
+    has_lines = False
+    has_text = False
+    next_token = None
+    try:
+        # Pagination for multi-page; part uploads overlap with fetching the next page
+        while True:
+            kwargs = {"JobId": textract_job_id}
+            if next_token:
+                kwargs["NextToken"] = next_token
+            page = TEXTRACT_CLIENT.get_document_text_detection(**kwargs)
+            lines = [b["Text"] for b in page.get("Blocks", []) if b["BlockType"] == "LINE"]
+            if lines:
+                if has_lines:
+                    buf += b"\n"
+                buf += "\n".join(lines).encode("utf-8")
+                has_lines = True
+                has_text = has_text or any(line.strip() for line in lines)
+            if len(buf) >= MULTIPART_CHUNK_BYTES:
+                futures.append(_submit_part(bucket, key, upload_id, len(futures) + 1, bytes(buf)))
+                buf.clear()
+            next_token = page.get("NextToken")
+            if not next_token:
+                break
+
+        if not has_text:
+            raise ValueError(
+                "No text could be extracted from this PDF. It may be image-only, scanned, or use an unsupported format."
+            )
+        if buf or not futures:
+            futures.append(_submit_part(bucket, key, upload_id, len(futures) + 1, bytes(buf)))
+        parts = [f.result() for f in futures]
+        S3.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        for f in futures:
+            f.cancel()
+        S3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+
+def _submit_part(bucket, key, upload_id, part_number, body):
+    """Upload one multipart part on the pool; future resolves to its Parts entry."""
+    def upload():
+        resp = S3.upload_part(
+            Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+        return {"ETag": resp["ETag"], "PartNumber": part_number}
+    return _POOL.submit(upload)
+
+
+def _start_batch_job(
+    input_uri, output_uri, role_arn, source_lang, target_codes, content_type, request_id=None
+):
+    """Start async batch translation job (idempotent per request_id on redelivery)."""
+    kwargs = {}
+    if request_id:
+        kwargs["ClientToken"] = request_id
+    resp = TRANSLATE_CLIENT.start_text_translation_job(
+        JobName=f"pdf-poly-lingo-{request_id or int(time.time())}",
+        InputDataConfig={
+            "S3Uri": input_uri,
+            "ContentType": content_type,
+        },
+        OutputDataConfig={"S3Uri": output_uri},
+        DataAccessRoleArn=role_arn,
+        SourceLanguageCode=source_lang,
+        TargetLanguageCodes=target_codes,
+        **kwargs,
+    )
+    return resp["JobId"]
+
+
+def _record_failure(request_id: str, error: str) -> None:
+    """Write failed status to DynamoDB so /status can return error to user."""
+    try:
+        DDB.update_item(
+            TableName=TABLE_NAME,
+            Key={"request_id": {"S": request_id}},
+            UpdateExpression="SET #s = :s, #e = :e",
+            ExpressionAttributeNames={"#s": "status", "#e": "error"},
+            ExpressionAttributeValues={
+                ":s": {"S": "failed"},
+                ":e": {"S": error[:500]},  # Limit length
+            },
+        )
+    except Exception as e:
+        print(f"Could not record failure for {request_id}: {e}")
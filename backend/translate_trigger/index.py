@@ -2,32 +2,69 @@
 
 import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import unquote
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # Batch translation supports: HTML, plain text, docx, pptx, xlsx, xlf
-# PDF requires Textract preprocessing
+# PDF requires Textract preprocessing (finished by textract_completion_handler)
 BATCH_TYPES = {".html", ".htm", ".txt"}
 PDF_TYPE = ".pdf"
 
-TRANSLATE_CLIENT = boto3.client("translate")
-TEXTRACT_CLIENT = boto3.client("textract")
-S3 = boto3.client("s3")
-DYNAMO = boto3.resource("dynamodb")
+BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# One shared session; resolve credentials during init rather than on the first call
+_SESSION = boto3.session.Session()
+_SESSION.get_credentials().get_frozen_credentials()
+TRANSLATE_CLIENT = _SESSION.client("translate", config=BOTO_CFG)
+S3 = _SESSION.client("s3", config=BOTO_CFG)
+SQS = _SESSION.client("sqs", config=BOTO_CFG)
+# Low-level client (thread-safe, unlike resource Table objects)
+DDB = _SESSION.client("dynamodb", config=BOTO_CFG)
+TABLE_NAME = os.environ.get("TABLE_NAME")
+
+# Missing objects (S3 event delivered before object is visible) are re-queued, not slept on
+RETRY_QUEUE_URL = os.environ.get("RETRY_QUEUE_URL")
+RETRY_DELAY_SECONDS = 5
+MAX_RETRY_ATTEMPTS = 5
+
+# Records in one event are processed concurrently
+_RECORD_POOL = ThreadPoolExecutor(max_workers=10)
+
+# Textract client is built lazily on record worker threads; boto3 Session is not thread-safe
+_TEXTRACT = None
+_TEXTRACT_LOCK = threading.Lock()
 
 
 def handler(event, context):
-    """Process S3 OBJECT_CREATED events under uploads/ prefix."""
+    """Process S3 OBJECT_CREATED events under uploads/ prefix (directly or re-queued via SQS)."""
+    futures = {}
     for record in event.get("Records", []):
+        attempt = 0
+        if record.get("eventSource") == "aws:sqs":
+            retry = json.loads(record["body"])
+            record, attempt = retry["record"], retry["attempt"]
         bucket = record["s3"]["bucket"]["name"]
         key = unquote(record["s3"]["object"]["key"])
         if not key.startswith("uploads/") or key.endswith("/"):
             continue
+        futures[_RECORD_POOL.submit(process_upload, bucket, key, record, attempt)] = key
+
+    for future in as_completed(futures):
+        key = futures[future]
         try:
-            process_upload(bucket, key, record)
+            future.result()
         except Exception as e:
             print(f"Error processing {key}: {e}")
             _record_failure(key, str(e))
@@ -35,91 +72,116 @@ def handler(event, context):
     return {"statusCode": 200}
 
 
-def process_upload(bucket, key, record):
-    """Start Translate job for the uploaded file."""
+def process_upload(bucket, key, record, attempt=0):
+    """Start Translate job for the uploaded file (PDFs start Textract first)."""
     input_bucket = os.environ["INPUT_BUCKET"]
     output_bucket = os.environ["OUTPUT_BUCKET"]
-    temp_bucket = os.environ["TEMP_BUCKET"]
     role_arn = os.environ["TRANSLATE_ROLE_ARN"]
-    topic_arn = os.environ["COMPLETION_TOPIC_ARN"]
 
     ext = "." + key.rsplit(".", 1)[-1].lower() if "." in key else ""
     prefix = key.rsplit("/", 1)[0] + "/"
     input_uri = f"s3://{input_bucket}/{prefix}"
     output_uri = f"s3://{output_bucket}/"
 
-    # Get object metadata (retry for S3 eventual consistency - can take several seconds)
-    for attempt in range(8):
-        try:
-            meta = S3.head_object(Bucket=bucket, Key=key).get("Metadata") or {}
-            break
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "404" and attempt < 7:
-                delay = min(2 ** attempt, 32)
-                time.sleep(delay)
-            else:
-                raise
-    target_lang = meta.get("target-language", "es")
-    source_lang = meta.get("source-language") or "auto"
-
-    target_codes = [target_lang] if target_lang else ["es"]
-
-    if ext in BATCH_TYPES:
-        content_type = _content_type(ext)
-        job_id = _start_batch_job(
-            input_uri=input_uri,
-            output_uri=output_uri,
-            role_arn=role_arn,
-            source_lang=source_lang,
-            target_codes=target_codes,
-            content_type=content_type,
-        )
-    elif ext == PDF_TYPE:
-        job_id = _process_pdf(
-            bucket=bucket,
-            key=key,
-            input_bucket=input_bucket,
-            output_bucket=output_bucket,
-            temp_bucket=temp_bucket,
-            role_arn=role_arn,
-            source_lang=source_lang,
-            target_codes=target_codes,
-        )
-    else:
-        raise ValueError(f"Unsupported format: {ext}. Use HTML, TXT, or PDF.")
-
     # Extract request_id and original filename from key: uploads/{request_id}/filename
     parts = key.split("/")
     request_id = parts[1] if len(parts) >= 2 else None
     original_filename = parts[-1] if parts else "document"
 
-    if request_id and os.environ.get("TABLE_NAME"):
-        table = DYNAMO.Table(os.environ["TABLE_NAME"])
-        table.put_item(Item={
-            "request_id": request_id,
-            "job_id": job_id,
-            "status": "in_progress",
-            "target_language": target_lang,
-            "original_filename": original_filename,
+    # Get object metadata; on 404 re-queue with delay instead of sleeping in the handler
+    try:
+        meta = S3.head_object(Bucket=bucket, Key=key).get("Metadata") or {}
+    except ClientError as e:
+        if (
+            e.response["Error"]["Code"] == "404"
+            and RETRY_QUEUE_URL
+            and attempt < MAX_RETRY_ATTEMPTS
+        ):
+            SQS.send_message(
+                QueueUrl=RETRY_QUEUE_URL,
+                MessageBody=json.dumps({"record": record, "attempt": attempt + 1}),
+                DelaySeconds=RETRY_DELAY_SECONDS,
+            )
+            return None
+        raise
+    target_lang = meta.get("target-language", "es")
+    source_lang = meta.get("source-language") or "auto"
+
+    target_codes = [target_lang] if target_lang else ["es"]
+
+    if ext == PDF_TYPE:
+        # Row first: textract_completion_handler reads the languages from it
+        _create_row(request_id, {
+            "status": {"S": "textract_running"},
+            "target_language": {"S": target_lang},
+            "source_language": {"S": source_lang},
+            "original_filename": {"S": original_filename},
         })
+        # Textract notifies TextractCompletionTopic; textract_completion_handler starts Translate
+        textract_job_id = _start_pdf_extraction(bucket=bucket, key=key, request_id=request_id)
+        if request_id and TABLE_NAME:
+            DDB.update_item(
+                TableName=TABLE_NAME,
+                Key={"request_id": {"S": request_id}},
+                UpdateExpression="SET textract_job_id = :t",
+                ExpressionAttributeValues={":t": {"S": textract_job_id}},
+            )
+        return textract_job_id
+
+    if ext not in BATCH_TYPES:
+        raise ValueError(f"Unsupported format: {ext}. Use HTML, TXT, or PDF.")
 
-    sns = boto3.client("sns")
-    sns.publish(
-        TopicArn=topic_arn,
-        Subject="Translation job started",
-        Message=json.dumps({
-            "job_id": job_id,
-            "key": key,
-            "target_language": target_lang,
-        }),
+    job_id = _start_batch_job(
+        input_uri=input_uri,
+        output_uri=output_uri,
+        role_arn=role_arn,
+        source_lang=source_lang,
+        target_codes=target_codes,
+        content_type=_content_type(ext),
+        request_id=request_id,
     )
+
+    _create_row(request_id, {
+        "job_id": {"S": job_id},
+        "status": {"S": "in_progress"},
+        "target_language": {"S": target_lang},
+        "original_filename": {"S": original_filename},
+    })
+
+    # Job-started event goes to CloudWatch Logs (no SNS round-trip on the hot path)
+    print(json.dumps({
+        "event": "job_started",
+        "job_id": job_id,
+        "key": key,
+        "target_language": target_lang,
+    }))
     return job_id
 
 
-def _start_batch_job(input_uri, output_uri, role_arn, source_lang, target_codes, content_type):
-    """Start async batch translation job."""
+def _create_row(request_id, attrs):
+    """Create the jobs row (this Lambda is its only creator); redelivered events never overwrite it."""
+    if not request_id or not TABLE_NAME:
+        return
+    try:
+        DDB.put_item(
+            TableName=TABLE_NAME,
+            Item={"request_id": {"S": request_id}, **attrs},
+            ConditionExpression="attribute_not_exists(request_id)",
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def _start_batch_job(
+    input_uri, output_uri, role_arn, source_lang, target_codes, content_type, request_id=None
+):
+    """Start async batch translation job (idempotent per request_id on redelivery)."""
+    kwargs = {}
+    if request_id:
+        kwargs["ClientToken"] = request_id
     resp = TRANSLATE_CLIENT.start_text_translation_job(
-        JobName=f"pdf-poly-lingo-{int(time.time())}",
+        JobName=f"pdf-poly-lingo-{request_id or int(time.time())}",
         InputDataConfig={
             "S3Uri": input_uri,
             "ContentType": content_type,
@@ -128,83 +190,40 @@ def _start_batch_job(input_uri, output_uri, role_arn, source_lang, target_codes,
         DataAccessRoleArn=role_arn,
         SourceLanguageCode=source_lang,
         TargetLanguageCodes=target_codes,
+        **kwargs,
     )
     return resp["JobId"]
 
 
-def _process_pdf(
-    bucket,
-    key,
-    input_bucket,
-    output_bucket,
-    temp_bucket,
-    role_arn,
-    source_lang,
-    target_codes,
-):
-    """Extract text from PDF via Textract, then run batch translation."""
-    job_id_txt = f"pdf-extract-{int(time.time())}"
-    temp_prefix = f"temp/{job_id_txt}/"
-
-    # Use async StartDocumentTextDetection - supports more PDF formats than sync DetectDocumentText
-    response = TEXTRACT_CLIENT.start_document_text_detection(
-        DocumentLocation={"S3Object": {"Bucket": bucket, "Name": key}}
-    )
-    textract_job_id = response["JobId"]
-
-    # Poll until complete (max ~5 min for large PDFs)
-    for _ in range(60):
-        status_resp = TEXTRACT_CLIENT.get_document_text_detection(JobId=textract_job_id)
-        status = status_resp["JobStatus"]
-        if status == "SUCCEEDED":
-            break
-        if status == "FAILED":
-            raise RuntimeError(
-                status_resp.get("StatusMessage", "Textract job failed")
-            )
-        time.sleep(5)
-
-    if status_resp["JobStatus"] != "SUCCEEDED":
-        raise RuntimeError("Textract job timed out")
-
-    # Collect all pages (pagination for multi-page)
-    blocks = list(status_resp.get("Blocks", []))
-    next_token = status_resp.get("NextToken")
-    while next_token:
-        page = TEXTRACT_CLIENT.get_document_text_detection(
-            JobId=textract_job_id, NextToken=next_token
-        )
-        blocks.extend(page.get("Blocks", []))
-        next_token = page.get("NextToken")
-
-    text_blocks = [b["Text"] for b in blocks if b["BlockType"] == "LINE"]
-    full_text = "\n".join(text_blocks) if text_blocks else ""
-
-    if not full_text.strip():
-        raise ValueError(
-            "No text could be extracted from this PDF. It may be image-only, scanned, or use an unsupported format."
-        )
-
-    # Write extracted text to temp bucket
-    txt_key = f"{temp_prefix}extracted.txt"
-    S3.put_object(
-        Bucket=temp_bucket,
-        Key=txt_key,
-        Body=full_text.encode("utf-8"),
-        ContentType="text/plain",
-    )
-
-    # Start Translate job on the extracted text
-    input_uri = f"s3://{temp_bucket}/{temp_prefix}"
-    output_uri = f"s3://{output_bucket}/"
-    return _start_batch_job(
-        input_uri=input_uri,
-        output_uri=output_uri,
-        role_arn=role_arn,
-        source_lang=source_lang,
-        target_codes=target_codes,
-        content_type="text/plain",
+def _textract():
+    """Textract client, built on the first PDF upload only."""
+    global _TEXTRACT
+    if _TEXTRACT is None:
+        with _TEXTRACT_LOCK:
+            if _TEXTRACT is None:
+                _TEXTRACT = _SESSION.client("textract", config=BOTO_CFG)
+    return _TEXTRACT
+
+
+def _start_pdf_extraction(bucket, key, request_id):
+    """Start async Textract text detection; completion is published to SNS.
+
+    ClientRequestToken makes redelivered events return the same JobId instead of a second job.
+    """
+    kwargs = {}
+    if request_id:
+        kwargs["ClientRequestToken"] = request_id
+    # Async StartDocumentTextDetection - supports more PDF formats than sync DetectDocumentText
+    response = _textract().start_document_text_detection(
+        DocumentLocation={"S3Object": {"Bucket": bucket, "Name": key}},
+        NotificationChannel={
+            "SNSTopicArn": os.environ["TEXTRACT_TOPIC_ARN"],
+            "RoleArn": os.environ["TEXTRACT_NOTIFY_ROLE_ARN"],
+        },
+        JobTag=request_id,
+        **kwargs,
     )
+    return response["JobId"]
 
 
 def _content_type(ext):
@@ -219,14 +238,13 @@ def _record_failure(key: str, error: str) -> None:
     """Write failed status to DynamoDB so /status can return error to user."""
     parts = key.split("/")
     request_id = parts[1] if len(parts) >= 2 else None
-    if not request_id or not os.environ.get("TABLE_NAME"):
+    if not request_id or not TABLE_NAME:
         return
     try:
-        table = DYNAMO.Table(os.environ["TABLE_NAME"])
-        table.put_item(Item={
-            "request_id": request_id,
-            "status": "failed",
-            "error": error[:500],  # Limit length
+        DDB.put_item(TableName=TABLE_NAME, Item={
+            "request_id": {"S": request_id},
+            "status": {"S": "failed"},
+            "error": {"S": error[:500]},  # Limit length
         })
     except Exception as e:
         print(f"Could not record failure for {request_id}: {e}")
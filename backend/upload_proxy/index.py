@@ -1,63 +1,168 @@
 """Proxy upload: receive file via API. Uses sync TranslateDocument for small HTML/TXT (instant)."""
 
-import base64
-import json
-import uuid
+import binascii
+import hashlib
+import io
 import os
+import secrets
+import zlib
+from urllib.parse import unquote
 
 import boto3
+import orjson
+import pybase64
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    from snapshot_restore_py import register_after_restore
+except ImportError:  # Only provided by the Lambda runtime
+    register_after_restore = None
 
 SYNC_MAX_BYTES = 100 * 1024  # 100 KB - TranslateDocument limit
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+# PDFs and files above this go straight to S3 via presigned PUT (no bytes through Lambda)
+DIRECT_UPLOAD_THRESHOLD = 512 * 1024
+DIRECT_UPLOAD_EXPIRES = 900
+# Base64 is decoded 64 KB at a time (multiple of 4 chars) instead of into one 5 MB buffer
+B64_CHUNK_CHARS = 64 * 1024
+# Sync results are stored in OutputBucket under sync/ and fetched via presigned GET
+SYNC_DOWNLOAD_EXPIRES = 300
+
+_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+
+_CONTENT_TYPE_MAP = {
+    ".html": "text/html",
+    ".htm": "text/html",
+    ".txt": "text/plain",
+    ".pdf": "application/pdf",
+}
+# Content types TranslateDocument can handle inline
+_SYNC_TYPES = frozenset(("text/html", "text/plain"))
+
+BOTO_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=10,
+)
+# TranslateDocument is on the user's critical path: fail fast on connect, keep the pool warm.
+# A large document can take well over 10 s, so the read timeout is close to the API Gateway
+# limit (29 s). In-call retries resend the document and are billed again; allow only one.
+TRANSLATE_CFG = BOTO_CFG.merge(Config(
+    max_pool_connections=25,
+    connect_timeout=2,
+    read_timeout=25,
+    retries={"mode": "adaptive", "max_attempts": 2},
+))
+
+# One shared session; resolve credentials during init rather than on the first call
+_SESSION = boto3.session.Session()
+_SESSION.get_credentials().get_frozen_credentials()
+translate_client = _SESSION.client("translate", config=TRANSLATE_CFG)
+# No SHA-256 payload signing (HTTPS + ChecksumCRC32 cover integrity): the body is read once
+s3_client = _SESSION.client(
+    "s3",
+    region_name=os.environ["REGION"],
+    config=BOTO_CFG.merge(Config(s3={"payload_signing_enabled": False})),
+)
+INPUT_BUCKET = os.environ["INPUT_BUCKET"]
+OUTPUT_BUCKET = os.environ["OUTPUT_BUCKET"]
+
 
-translate_client = boto3.client("translate")
-s3_client = boto3.client("s3")
-dynamo = boto3.resource("dynamodb")
+def _prewarm():
+    """Load operation models and endpoints, and open connections, before the first request.
+
+    Runs at init (models and endpoints survive a SnapStart snapshot) and again after
+    restore, since sockets in the snapshot are not reusable.
+    """
+    for call, kwargs in (
+        (s3_client.head_bucket, {"Bucket": OUTPUT_BUCKET}),
+        (translate_client.list_languages, {"MaxResults": 1}),
+    ):
+        try:
+            call(**kwargs)
+        except Exception as e:
+            print(f"Prewarm {call.__name__} failed: {e}")
+
+
+_prewarm()
+if register_after_restore:
+    register_after_restore(_prewarm)
 
 
 def handler(event, context):
-    """Accept base64 file. If small HTML/TXT, translate sync and return. Else upload to S3."""
+    """Accept base64 file. If small HTML/TXT, translate sync and return. Else upload to S3.
+
+    Body is either JSON {"file": base64, "filename", "target_language", "source_language"}
+    or the raw file (application/octet-stream, base64-encoded by API Gateway) with
+    X-Filename (percent-encoded) / X-Target-Language / X-Source-Language headers.
+    JSON without "file" for a PDF (or "size" above DIRECT_UPLOAD_THRESHOLD) returns
+    a presigned PUT "upload_url" + "upload_headers" instead.
+    """
     try:
-        body = json.loads(event.get("body") or "{}")
-        file_b64 = body.get("file")
-        filename = body.get("filename", "document")
-        target_lang = body.get("target_language", "es")
-        source_lang = body.get("source_language") or "auto"
+        size = 0
+        if event.get("isBase64Encoded"):
+            headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+            file_b64 = event.get("body")
+            filename = unquote(headers.get("x-filename", "document"))
+            target_lang = headers.get("x-target-language", "es")
+            source_lang = headers.get("x-source-language") or "auto"
+        else:
+            body = orjson.loads(event.get("body") or "{}")
+            file_b64 = body.get("file")
+            filename = body.get("filename", "document")
+            target_lang = body.get("target_language", "es")
+            source_lang = body.get("source_language") or "auto"
+            try:
+                size = int(body.get("size") or 0)
+            except (TypeError, ValueError):
+                return _response(400, {"error": "Invalid 'size' (bytes)"})
+
+        dot = filename.rfind(".")
+        ext = filename[dot:].lower() if dot >= 0 else ""
+        content_type = _CONTENT_TYPE_MAP.get(ext, "application/octet-stream")
 
         if not file_b64:
+            if ext == ".pdf" or size > DIRECT_UPLOAD_THRESHOLD:
+                return _direct_upload(filename, content_type, target_lang, source_lang)
             return _response(400, {"error": "Missing 'file' (base64)"})
 
-        content = base64.b64decode(file_b64)
+        # Cheap shape checks before allocating anything; characters are validated by the decoder
+        if len(file_b64) % 4:
+            return _response(400, {"error": "Invalid base64 in 'file'"})
 
-        ext = os.path.splitext(filename)[1].lower()
-        content_type_map = {
-            ".html": "text/html",
-            ".htm": "text/html",
-            ".txt": "text/plain",
-            ".pdf": "application/pdf",
-        }
-        content_type = content_type_map.get(ext, "application/octet-stream")
+        # Decoded size from the base64 length - route before decoding anything
+        approx_len = len(file_b64) * 3 // 4 - file_b64[-2:].count("=")
 
         # Fast path: small HTML/TXT - sync TranslateDocument (returns in seconds)
-        if (
-            len(content) <= SYNC_MAX_BYTES
-            and content_type in ("text/html", "text/plain")
-        ):
+        if approx_len <= SYNC_MAX_BYTES and content_type in _SYNC_TYPES:
+            try:
+                content = pybase64.b64decode(file_b64, validate=True)
+            except binascii.Error:
+                return _response(400, {"error": "Invalid base64 in 'file'"})
             return _translate_sync(content, content_type, filename, target_lang, source_lang)
 
         # Async path: larger files or PDF - upload to S3
-        if len(content) > 5 * 1024 * 1024:
+        if approx_len > MAX_UPLOAD_BYTES:
             return _response(400, {"error": "File too large (max 5MB)"})
 
-        request_id = str(uuid.uuid4())
+        crc = _b64_crc32(file_b64)
+        if crc is None:
+            return _response(400, {"error": "Invalid base64 in 'file'"})
+
+        request_id = secrets.token_hex(16)
         key = f"uploads/{request_id}/{filename}"
-        bucket = os.environ["INPUT_BUCKET"]
-        region = os.environ["REGION"]
-        s3 = boto3.client("s3", region_name=region)
 
-        s3.put_object(
-            Bucket=bucket,
+        # The jobs row is created by translate_trigger; /status reports "pending" until then
+        s3_client.put_object(
+            Bucket=INPUT_BUCKET,
             Key=key,
-            Body=content,
+            Body=Base64Stream(file_b64, approx_len),
+            # Precomputed checksum header: single PUT with Content-Length, no aws-chunked trailer
+            ContentLength=approx_len,
+            ChecksumCRC32=pybase64.b64encode(crc.to_bytes(4, "big")).decode("ascii"),
             ContentType=content_type,
             Metadata={
                 "target-language": target_lang,
@@ -65,16 +170,6 @@ def handler(event, context):
             },
         )
 
-        # Write initial record so /status returns immediately (avoids stuck "pending")
-        if os.environ.get("TABLE_NAME"):
-            table = dynamo.Table(os.environ["TABLE_NAME"])
-            table.put_item(Item={
-                "request_id": request_id,
-                "status": "processing",
-                "target_language": target_lang,
-                "original_filename": filename,
-            })
-
         return _response(200, {
             "sync": False,
             "request_id": request_id,
@@ -85,24 +180,152 @@ def handler(event, context):
         return _response(500, {"error": str(e)})
 
 
+class Base64Stream(io.RawIOBase):
+    """Seekable, read-only view of base64 text as decoded bytes.
+
+    Each read decodes only the 4-char groups it covers, so PutObject streams the
+    body without a full decoded copy. Seeking lets botocore rewind for checksums
+    and retries. Input must already be validated (see _b64_crc32).
+    """
+
+    def __init__(self, encoded, length):
+        super().__init__()
+        self._encoded = encoded
+        self._length = length
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._length
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buf):
+        n = min(len(buf), self._length - self._pos)
+        if n <= 0:
+            return 0
+        start = self._pos // 3 * 4
+        end = -(-(self._pos + n) // 3) * 4
+        skip = self._pos % 3
+        buf[:n] = pybase64.b64decode(self._encoded[start:end])[skip:skip + n]
+        self._pos += n
+        return n
+
+
+def _b64_crc32(encoded):
+    """Validate base64 chunk by chunk and return CRC32 of the decoded bytes (None if invalid).
+
+    Padding is only allowed in the final chunk.
+    """
+    last = len(encoded) - B64_CHUNK_CHARS
+    crc = 0
+    try:
+        for i in range(0, len(encoded), B64_CHUNK_CHARS):
+            chunk = encoded[i:i + B64_CHUNK_CHARS]
+            if i < last and "=" in chunk[-2:]:
+                return None
+            crc = zlib.crc32(pybase64.b64decode(chunk, validate=True), crc)
+    except binascii.Error:
+        return None
+    return crc
+
+
+def _direct_upload(filename, content_type, target_lang, source_lang):
+    """Presigned PUT so the browser uploads straight to S3; ObjectCreated still fires the trigger."""
+    request_id = secrets.token_hex(16)
+    key = f"uploads/{request_id}/{filename}"
+    metadata = {
+        "target-language": target_lang,
+        "source-language": source_lang,
+    }
+    url = s3_client.generate_presigned_url(
+        "put_object",
+        Params={
+            "Bucket": INPUT_BUCKET,
+            "Key": key,
+            "ContentType": content_type,
+            "Metadata": metadata,
+        },
+        ExpiresIn=DIRECT_UPLOAD_EXPIRES,
+    )
+    return _response(200, {
+        "sync": False,
+        "request_id": request_id,
+        "key": key,
+        "upload_url": url,
+        # Signed headers - the PUT must send exactly these
+        "upload_headers": {
+            "Content-Type": content_type,
+            **{f"x-amz-meta-{k}": v for k, v in metadata.items()},
+        },
+        "message": "PUT the file to upload_url, then use /status to poll for result.",
+    })
+
+
 def _translate_sync(content, content_type, filename, target_lang, source_lang):
-    """Use TranslateDocument for instant result."""
-    resp = translate_client.translate_document(
-        Document={"Content": content, "ContentType": content_type},
-        SourceLanguageCode=source_lang,
-        TargetLanguageCode=target_lang,
+    """Use TranslateDocument for instant result; the client downloads it from OutputBucket.
+
+    The key is a hash of type, languages and content, so repeat uploads skip Translate.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (content_type, source_lang, target_lang):
+        digest.update(part.encode("utf-8") + b"\0")
+    digest.update(content)
+    dot = filename.rfind(".")
+    ext = filename[dot:].lower()
+    key = f"sync/{digest.hexdigest()}{ext}"
+
+    if not _output_exists(key):
+        resp = translate_client.translate_document(
+            Document={"Content": content, "ContentType": content_type},
+            SourceLanguageCode=source_lang,
+            TargetLanguageCode=target_lang,
+        )
+        s3_client.put_object(
+            Bucket=OUTPUT_BUCKET,
+            Key=key,
+            Body=resp["TranslatedDocument"]["Content"],
+            ContentType=f"{content_type}; charset=utf-8",
+        )
+
+    download_name = f"{filename[:dot] or 'document'}_translated_{target_lang}{ext}"
+    url = s3_client.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": OUTPUT_BUCKET,
+            "Key": key,
+            # inline so the test app's iframe previews it; the header still names saved files
+            "ResponseContentDisposition": f'inline; filename="{download_name}"',
+        },
+        ExpiresIn=SYNC_DOWNLOAD_EXPIRES,
     )
-    translated = resp["TranslatedDocument"]["Content"]
     return _response(200, {
         "sync": True,
-        "translated_base64": base64.b64encode(translated).decode(),
-        "filename": filename,
+        "download_url": url,
+        "filename": download_name,
     })
 
 
+def _output_exists(key):
+    try:
+        s3_client.head_object(Bucket=OUTPUT_BUCKET, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return False
+        raise
+    return True
+
+
 def _response(status, body):
-    return {
-        "statusCode": status,
-        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
-        "body": json.dumps(body),
-    }
+    return {"statusCode": status, "headers": _HEADERS, "body": orjson.dumps(body).decode()}
@@ -59,6 +59,8 @@ class PipelineStack(Stack):
             "Pipeline",
             pipeline_name="pdf-poly-lingo",
             synth=synth,
+            # Lambda assets with a requirements.txt are bundled in a Docker build image
+            docker_enabled_for_synth=True,
         )
 
         pipeline.add_stage(TranslationServiceStage(self, "Prod"))
@@ -1,6 +1,9 @@
 """Translation service stack: S3, Lambda, Amazon Translate, API Gateway, IAM."""
 
+import os
+
 from aws_cdk import (
+    BundlingOptions,
     Duration,
     RemovalPolicy,
     Stack,
@@ -10,11 +13,39 @@ from aws_cdk import (
     aws_apigateway as apigw,
     aws_iam as iam,
     aws_sns as sns,
+    aws_sns_subscriptions as sns_subs,
+    aws_sqs as sqs,
+    aws_lambda_event_sources as lambda_events,
     aws_dynamodb as dynamodb,
 )
 from constructs import Construct
 
 
+def _lambda_code(
+    path: str, architecture: _lambda.Architecture = _lambda.Architecture.X86_64
+) -> _lambda.Code:
+    """Lambda asset; folders with a requirements.txt get their dependencies bundled.
+
+    The build image runs on the host platform; pip fetches wheels for the target architecture.
+    """
+    if not os.path.exists(os.path.join(path, "requirements.txt")):
+        return _lambda.Code.from_asset(path)
+    wheel_platform = "manylinux2014_aarch64" if architecture.name == "arm64" else "manylinux2014_x86_64"
+    return _lambda.Code.from_asset(
+        path,
+        bundling=BundlingOptions(
+            image=_lambda.Runtime.PYTHON_3_12.bundling_image,
+            command=[
+                "bash",
+                "-c",
+                "pip install -r requirements.txt -t /asset-output"
+                f" --platform {wheel_platform} --only-binary=:all: --python-version 3.12"
+                " && cp -au . /asset-output",
+            ],
+        ),
+    )
+
+
 class TranslationServiceStack(Stack):
     """AWS-native translation pipeline: upload -> Translate -> deliver."""
 
@@ -48,6 +79,8 @@ class TranslationServiceStack(Stack):
             removal_policy=RemovalPolicy.DESTROY,
             auto_delete_objects=True,
             block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            # Sync (TranslateDocument) results are cached by content hash for a day
+            lifecycle_rules=[s3.LifecycleRule(prefix="sync/", expiration=Duration.days(1))],
             cors=[
                 s3.CorsRule(
                     allowed_methods=[s3.HttpMethods.GET, s3.HttpMethods.HEAD],
@@ -72,6 +105,12 @@ class TranslationServiceStack(Stack):
             partition_key=dynamodb.Attribute(name="request_id", type=dynamodb.AttributeType.STRING),
             removal_policy=RemovalPolicy.DESTROY,
         )
+        # Lookup by Translate job_id (notification handler); only request_id is needed back
+        jobs_table.add_global_secondary_index(
+            index_name="job_id-index",
+            partition_key=dynamodb.Attribute(name="job_id", type=dynamodb.AttributeType.STRING),
+            projection_type=dynamodb.ProjectionType.KEYS_ONLY,
+        )
 
         # ----- IAM Role for Amazon Translate -----
         translate_role = iam.Role(
@@ -91,38 +130,68 @@ class TranslationServiceStack(Stack):
             display_name="PDF Poly Lingo Translation Complete",
         )
 
+        # ----- SNS Topic + role for async Textract (PDF) completion -----
+        textract_topic = sns.Topic(
+            self,
+            "TextractCompletionTopic",
+            display_name="PDF Poly Lingo Textract Complete",
+        )
+        textract_notify_role = iam.Role(
+            self,
+            "TextractNotifyRole",
+            assumed_by=iam.ServicePrincipal("textract.amazonaws.com"),
+            description="Role for Amazon Textract to publish job completion to SNS",
+        )
+        textract_topic.grant_publish(textract_notify_role)
+
         # ----- Lambda: Proxy upload (avoids S3 CORS, max 5MB) -----
+        # Graviton + more memory (more CPU) for base64/JSON; SnapStart serves the "live" alias
         upload_proxy = _lambda.Function(
             self,
             "UploadProxy",
             runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
             handler="index.handler",
-            code=_lambda.Code.from_asset("backend/upload_proxy"),
+            code=_lambda_code("backend/upload_proxy", _lambda.Architecture.ARM_64),
             timeout=Duration.seconds(30),
-            memory_size=256,
+            memory_size=1024,
+            snap_start=_lambda.SnapStartConf.ON_PUBLISHED_VERSIONS,
             environment={
                 "INPUT_BUCKET": input_bucket.bucket_name,
+                "OUTPUT_BUCKET": output_bucket.bucket_name,
                 "REGION": self.region,
-                "TABLE_NAME": jobs_table.table_name,
             },
         )
         input_bucket.grant_put(upload_proxy)
-        jobs_table.grant_read_write_data(upload_proxy)
+        output_bucket.grant_read_write(upload_proxy, objects_key_pattern="sync/*")
         upload_proxy.add_to_role_policy(
-            iam.PolicyStatement(actions=["translate:TranslateDocument"], resources=["*"])
+            iam.PolicyStatement(
+                # ListLanguages only primes the connection at init
+                actions=["translate:TranslateDocument", "translate:ListLanguages"],
+                resources=["*"],
+            )
         )
         # Required for source_language="auto" (Translate uses Comprehend internally)
         upload_proxy.add_to_role_policy(
             iam.PolicyStatement(actions=["comprehend:DetectDominantLanguage"], resources=["*"])
         )
 
+        upload_proxy_live = _lambda.Alias(
+            self,
+            "UploadProxyLive",
+            alias_name="live",
+            version=upload_proxy.current_version,
+        )
+
         # ----- Lambda: Presigned URL -----
+        # No SnapStart: signs with credentials frozen at init, which must not come from a snapshot
         presigned_handler = _lambda.Function(
             self,
             "PresignedUrlHandler",
             runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
             handler="index.handler",
-            code=_lambda.Code.from_asset("backend/presigned_url"),
+            code=_lambda_code("backend/presigned_url", _lambda.Architecture.ARM_64),
             timeout=Duration.seconds(10),
             environment={
                 "INPUT_BUCKET": input_bucket.bucket_name,
@@ -131,27 +200,36 @@ class TranslationServiceStack(Stack):
         )
         input_bucket.grant_put(presigned_handler)
 
+        # ----- SQS: delayed retry when S3 event arrives before object is readable -----
+        upload_retry_queue = sqs.Queue(
+            self,
+            "UploadRetryQueue",
+            visibility_timeout=Duration.minutes(2),
+        )
+
         # ----- Lambda: S3 trigger -> Start Translate job -----
         translate_trigger = _lambda.Function(
             self,
             "TranslateTrigger",
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="index.handler",
-            code=_lambda.Code.from_asset("backend/translate_trigger"),
-            timeout=Duration.minutes(6),
+            code=_lambda_code("backend/translate_trigger"),
+            timeout=Duration.minutes(1),
             environment={
                 "INPUT_BUCKET": input_bucket.bucket_name,
                 "OUTPUT_BUCKET": output_bucket.bucket_name,
-                "TEMP_BUCKET": temp_bucket.bucket_name,
                 "TRANSLATE_ROLE_ARN": translate_role.role_arn,
-                "COMPLETION_TOPIC_ARN": completion_topic.topic_arn,
                 "TABLE_NAME": jobs_table.table_name,
+                "TEXTRACT_TOPIC_ARN": textract_topic.topic_arn,
+                "TEXTRACT_NOTIFY_ROLE_ARN": textract_notify_role.role_arn,
+                "RETRY_QUEUE_URL": upload_retry_queue.queue_url,
             },
         )
+        upload_retry_queue.grant_send_messages(translate_trigger)
+        translate_trigger.add_event_source(lambda_events.SqsEventSource(upload_retry_queue))
         jobs_table.grant_read_write_data(translate_trigger)
         input_bucket.grant_read(translate_trigger)
         output_bucket.grant_read(translate_trigger)
-        temp_bucket.grant_read_write(translate_trigger)
         translate_trigger.add_to_role_policy(
             iam.PolicyStatement(
                 actions=[
@@ -171,16 +249,18 @@ class TranslationServiceStack(Stack):
         )
         translate_trigger.add_to_role_policy(
             iam.PolicyStatement(
-                actions=[
-                    "textract:DetectDocumentText",
-                    "textract:AnalyzeDocument",
-                    "textract:StartDocumentTextDetection",
-                    "textract:GetDocumentTextDetection",
-                ],
+                actions=["textract:StartDocumentTextDetection"],
                 resources=["*"],
             )
         )
-        completion_topic.grant_publish(translate_trigger)
+        # Lambda must be allowed to pass the notify role to Textract
+        translate_trigger.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["iam:PassRole"],
+                resources=[textract_notify_role.role_arn],
+                conditions={"StringEquals": {"iam:PassedToService": "textract.amazonaws.com"}},
+            )
+        )
 
         input_bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
@@ -188,14 +268,57 @@ class TranslationServiceStack(Stack):
             s3.NotificationKeyFilter(prefix="uploads/"),
         )
 
+        # ----- Lambda: Textract completion -> Start Translate job (PDF) -----
+        textract_completion_handler = _lambda.Function(
+            self,
+            "TextractCompletionHandler",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="index.handler",
+            code=_lambda_code("backend/textract_completion_handler"),
+            timeout=Duration.minutes(2),
+            environment={
+                "OUTPUT_BUCKET": output_bucket.bucket_name,
+                "TEMP_BUCKET": temp_bucket.bucket_name,
+                "TRANSLATE_ROLE_ARN": translate_role.role_arn,
+                "TABLE_NAME": jobs_table.table_name,
+            },
+        )
+        jobs_table.grant_read_write_data(textract_completion_handler)
+        temp_bucket.grant_read_write(textract_completion_handler)
+        textract_completion_handler.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "translate:StartTextTranslationJob",
+                    "textract:GetDocumentTextDetection",
+                ],
+                resources=["*"],
+            )
+        )
+        textract_completion_handler.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["iam:PassRole"],
+                resources=[translate_role.role_arn],
+                conditions={"StringEquals": {"iam:PassedToService": "translate.amazonaws.com"}},
+            )
+        )
+        textract_topic.add_subscription(sns_subs.LambdaSubscription(textract_completion_handler))
+
         # ----- Lambda: Output bucket notification -----
+        # Async S3 invokes are retried, then kept in a DLQ (status relies on this handler)
+        notification_dlq = sqs.Queue(
+            self,
+            "NotificationDlq",
+            retention_period=Duration.days(14),
+        )
         notification_handler = _lambda.Function(
             self,
             "NotificationHandler",
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="index.handler",
-            code=_lambda.Code.from_asset("backend/notification_handler"),
+            code=_lambda_code("backend/notification_handler"),
             timeout=Duration.seconds(30),
+            retry_attempts=2,
+            dead_letter_queue=notification_dlq,
             environment={
                 "COMPLETION_TOPIC_ARN": completion_topic.topic_arn,
                 "TABLE_NAME": jobs_table.table_name,
@@ -204,9 +327,11 @@ class TranslationServiceStack(Stack):
         jobs_table.grant_read_write_data(notification_handler)
         output_bucket.grant_read(notification_handler)
         completion_topic.grant_publish(notification_handler)
+        # Only batch job output ({account}-TranslateText-{job}/...), not sync/ results
         output_bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
             s3n.LambdaDestination(notification_handler),
+            s3.NotificationKeyFilter(prefix=f"{self.account}-TranslateText-"),
         )
 
         # ----- API Gateway -----
@@ -214,15 +339,23 @@ class TranslationServiceStack(Stack):
             self,
             "TranslationApi",
             rest_api_name="PDF Poly Lingo Translation API",
+            # Raw file uploads to /upload arrive base64-encoded without a JSON envelope
+            binary_media_types=["application/octet-stream"],
             default_cors_preflight_options=apigw.CorsOptions(
                 allow_origins=apigw.Cors.ALL_ORIGINS,
                 allow_methods=apigw.Cors.ALL_METHODS,
-                allow_headers=["Content-Type", "Authorization"],
+                allow_headers=[
+                    "Content-Type",
+                    "Authorization",
+                    "X-Filename",
+                    "X-Target-Language",
+                    "X-Source-Language",
+                ],
             ),
         )
         # Proxy upload (no CORS issues, max 5MB)
         upload_resource = api.root.add_resource("upload")
-        upload_resource.add_method("POST", apigw.LambdaIntegration(upload_proxy))
+        upload_resource.add_method("POST", apigw.LambdaIntegration(upload_proxy_live))
 
         presigned_resource = api.root.add_resource("presigned-url")
         presigned_resource.add_method("POST", apigw.LambdaIntegration(presigned_handler))
@@ -233,30 +366,25 @@ class TranslationServiceStack(Stack):
             self,
             "StatusHandler",
             runtime=_lambda.Runtime.PYTHON_3_12,
+            architecture=_lambda.Architecture.ARM_64,
             handler="index.handler",
-            code=_lambda.Code.from_asset("backend/status_handler"),
+            code=_lambda_code("backend/status_handler", _lambda.Architecture.ARM_64),
             timeout=Duration.seconds(10),
+            snap_start=_lambda.SnapStartConf.ON_PUBLISHED_VERSIONS,
             environment={
                 "TABLE_NAME": jobs_table.table_name,
-                "OUTPUT_BUCKET": output_bucket.bucket_name,
                 "REGION": self.region,
             },
         )
         jobs_table.grant_read_write_data(status_handler)
         output_bucket.grant_read(status_handler)
-        status_handler.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["s3:ListBucket"],
-                resources=[output_bucket.bucket_arn],
-            )
-        )
-        status_handler.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["translate:DescribeTextTranslationJob"],
-                resources=["*"],
-            )
+        status_handler_live = _lambda.Alias(
+            self,
+            "StatusHandlerLive",
+            alias_name="live",
+            version=status_handler.current_version,
         )
-        status_resource.add_method("GET", apigw.LambdaIntegration(status_handler))
+        status_resource.add_method("GET", apigw.LambdaIntegration(status_handler_live))
 
         # ----- Outputs -----
         from aws_cdk import CfnOutput
@@ -1,6 +1,9 @@
 import { useState, useEffect, useRef } from 'react'
 import './App.css'
 
+// PDFs and files above this are PUT straight to S3 via a presigned URL from /upload
+const DIRECT_UPLOAD_THRESHOLD = 512 * 1024
+
 const LANGUAGES = [
   { code: 'es', name: 'Spanish' },
   { code: 'fr', name: 'French' },
@@ -45,14 +48,6 @@ function App() {
     setProgress(0)
   }
 
-  const fileToBase64 = (f) =>
-    new Promise((resolve, reject) => {
-      const r = new FileReader()
-      r.onload = () => resolve(r.result.split(',')[1])
-      r.onerror = reject
-      r.readAsDataURL(f)
-    })
-
   const handleTranslate = async () => {
     if (!file || !apiEndpoint) {
       setError(apiEndpoint ? 'Select a file first.' : 'Set VITE_API_ENDPOINT in .env')
@@ -71,18 +66,30 @@ function App() {
 
     try {
       setProgress(15)
-      const base64 = await fileToBase64(file)
+      const direct = file.name.toLowerCase().endsWith('.pdf') || file.size > DIRECT_UPLOAD_THRESHOLD
       setProgress(25)
-      const res = await fetch(`${apiEndpoint}/upload`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          file: base64,
-          filename: file.name,
-          target_language: targetLang,
-          source_language: 'auto',
-        }),
-      })
+      // Small files go as raw bytes (no base64/JSON envelope); large ones get a presigned PUT
+      const res = await fetch(`${apiEndpoint}/upload`, direct
+        ? {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+              filename: file.name,
+              target_language: targetLang,
+              source_language: 'auto',
+              size: file.size,
+            }),
+          }
+        : {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/octet-stream',
+              'X-Filename': encodeURIComponent(file.name),
+              'X-Target-Language': targetLang,
+              'X-Source-Language': 'auto',
+            },
+            body: file,
+          })
       setProgress(50)
       if (!res.ok) {
         const data = await res.json().catch(() => ({}))
@@ -90,10 +97,17 @@ function App() {
       }
       const data = await res.json()
 
-      if (data.sync && data.translated_base64) {
-        const bytes = Uint8Array.from(atob(data.translated_base64), (c) => c.charCodeAt(0))
-        const blob = new Blob([bytes], { type: data.filename?.endsWith('.html') ? 'text/html' : 'text/plain' })
-        setTranslatedUrl(URL.createObjectURL(blob))
+      if (data.upload_url) {
+        const put = await fetch(data.upload_url, {
+          method: 'PUT',
+          headers: data.upload_headers,
+          body: file,
+        })
+        if (!put.ok) throw new Error(`Upload failed: ${put.status}`)
+      }
+
+      if (data.sync && data.download_url) {
+        setTranslatedUrl(data.download_url)
         setProgress(100)
         setStatus('complete')
       } else {
@@ -121,7 +135,7 @@ function App() {
         setError(data.error)
         setStatus('error')
         stopPolling()
-      } else if (data.status === 'in_progress' || data.status === 'processing') {
+      } else if (['in_progress', 'processing', 'textract_running'].includes(data.status)) {
         setProgress((p) => Math.min(p + 4, 95))
       }
     } catch {
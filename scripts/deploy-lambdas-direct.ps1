@@ -19,12 +19,14 @@ $ErrorActionPreference = "Stop"
 $BackendRoot = Join-Path $PSScriptRoot "..\backend"
 
 # Map folder name -> CDK logical ID substring (used to find Lambda by name)
+# Arch must match the function's architecture in translation_service_stack.py (wheel platform)
 $Lambdas = @(
-  @{ Folder = "upload_proxy";      Pattern = "UploadProxy" }
-  @{ Folder = "presigned_url";     Pattern = "PresignedUrlHandler" }
-  @{ Folder = "translate_trigger"; Pattern = "TranslateTrigger" }
-  @{ Folder = "notification_handler"; Pattern = "NotificationHandler" }
-  @{ Folder = "status_handler";    Pattern = "StatusHandler" }
+  @{ Folder = "upload_proxy";      Pattern = "UploadProxy";         Arch = "arm64" }
+  @{ Folder = "presigned_url";     Pattern = "PresignedUrlHandler"; Arch = "arm64" }
+  @{ Folder = "translate_trigger"; Pattern = "TranslateTrigger";    Arch = "x86_64" }
+  @{ Folder = "textract_completion_handler"; Pattern = "TextractCompletionHandler"; Arch = "x86_64" }
+  @{ Folder = "notification_handler"; Pattern = "NotificationHandler"; Arch = "x86_64" }
+  @{ Folder = "status_handler";    Pattern = "StatusHandler";       Arch = "arm64" }
 )
 
 $TempDir = Join-Path $env:TEMP "pdf-poly-lingo-lambda-deploy"
@@ -44,6 +46,19 @@ foreach ($lambda in $Lambdas) {
     continue
   }
 
+  # Folders with requirements.txt need their dependencies packaged alongside index.py
+  $reqPath = Join-Path $srcPath "requirements.txt"
+  if (Test-Path $reqPath) {
+    $buildPath = Join-Path $TempDir "$folder-build"
+    Remove-Item $buildPath -Recurse -Force -ErrorAction SilentlyContinue
+    Copy-Item -Path $srcPath -Destination $buildPath -Recurse
+    Write-Host "  Installing $folder dependencies..." -NoNewline
+    $wheelPlatform = if ($lambda.Arch -eq "arm64") { "manylinux2014_aarch64" } else { "manylinux2014_x86_64" }
+    pip install -r $reqPath -t $buildPath --platform $wheelPlatform --only-binary=:all: --python-version 3.12 --quiet
+    Write-Host " done"
+    $srcPath = $buildPath
+  }
+
   Write-Host "  Zipping $folder..." -NoNewline
   $zipFullPath = Resolve-Path $zipPath -ErrorAction SilentlyContinue
   Remove-Item $zipPath -Force -ErrorAction SilentlyContinue
@@ -72,31 +87,46 @@ foreach ($lambda in $Lambdas) {
       --output text 2>&1 | Out-Null
     Write-Host " OK" -ForegroundColor Green
 
-    # upload_proxy needs TABLE_NAME; copy from TranslateTrigger if missing
+    # upload_proxy needs OUTPUT_BUCKET; copy from TranslateTrigger if missing
     if ($folder -eq "upload_proxy") {
       try {
         $triggerFn = aws lambda list-functions --region $Region `
           --query "Functions[?contains(FunctionName, 'TranslateTrigger')].FunctionName | [0]" --output text 2>$null
         if ($triggerFn -and $triggerFn -ne "None") {
-          $tableName = aws lambda get-function-configuration --function-name $triggerFn --region $Region `
-            --query "Environment.Variables.TABLE_NAME" --output text 2>$null
-          if ($tableName -and $tableName -ne "None") {
+          $outputBucket = aws lambda get-function-configuration --function-name $triggerFn --region $Region `
+            --query "Environment.Variables.OUTPUT_BUCKET" --output text 2>$null
+          if ($outputBucket -and $outputBucket -ne "None") {
             $curr = aws lambda get-function-configuration --function-name $fn --region $Region --output json 2>$null | ConvertFrom-Json
             $vars = @{}
             $curr.Environment.Variables.PSObject.Properties | ForEach-Object { $vars[$_.Name] = $_.Value }
-            if (-not $vars["TABLE_NAME"]) {
-              $vars["TABLE_NAME"] = $tableName
+            if (-not $vars["OUTPUT_BUCKET"]) {
+              $vars["OUTPUT_BUCKET"] = $outputBucket
               $envFile = Join-Path $TempDir "upload_proxy_env.json"
               @{ Variables = $vars } | ConvertTo-Json -Depth 3 | Set-Content -Path $envFile -Encoding UTF8 -NoNewline
-              Write-Host "  Adding TABLE_NAME to UploadProxy env..." -NoNewline
+              Write-Host "  Adding OUTPUT_BUCKET to UploadProxy env..." -NoNewline
               $envJson = Get-Content $envFile -Raw
+              aws lambda wait function-updated --function-name $fn --region $Region
               aws lambda update-function-configuration --function-name $fn --region $Region --environment $envJson 2>&1 | Out-Null
+              aws lambda wait function-updated --function-name $fn --region $Region
               Write-Host " OK" -ForegroundColor Green
             }
           }
         }
       } catch { Write-Host " (skip)" -ForegroundColor Yellow }
     }
+
+    # SnapStart functions are invoked through the "live" alias; publish and repoint it
+    $alias = aws lambda get-alias --function-name $fn --name live --region $Region `
+      --query "Name" --output text 2>$null
+    if ($alias -eq "live") {
+      Write-Host "  Publishing version for alias live..." -NoNewline
+      aws lambda wait function-updated --function-name $fn --region $Region
+      $version = aws lambda publish-version --function-name $fn --region $Region `
+        --query "Version" --output text
+      aws lambda update-alias --function-name $fn --name live --function-version $version `
+        --region $Region --output text 2>&1 | Out-Null
+      Write-Host " v$version" -ForegroundColor Green
+    }
   } catch {
     Write-Host " FAILED" -ForegroundColor Red
     Write-Error $_